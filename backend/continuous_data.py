@@ -1,6 +1,9 @@
 """
 Continuous data generator for real-time dashboard with multiple sensors.
-Run this script to keep the database updated with new data points.
+The API server runs tick() once per second on its own event loop, so while
+the backend is up the database is kept updated without this script.
+Run it directly only to generate data without the API; running both at
+once would write every slot twice.
 It generates one data point per second per sensor indefinitely.
 
 Sensors: THS No. 1, THS No. 2, THS No. 3
@@ -12,16 +15,16 @@ Usage:
 This will:
 - Generate new data points every second for each sensor with random walk
 - Insert them into the database with current timestamps
-- Automatically clean up data older than 60 minutes
+- Overwrite the reading from 60 minutes ago (the metrics table is a ring buffer)
 - Run indefinitely until you press Ctrl+C
 """
 
 import time
-import random
+import numpy as np
 from db import get_db
-
-# Sensor list
-SENSORS = ["THS No. 1", "THS No. 2", "THS No. 3"]
+from models import INSERT_METRIC
+from random_walk import bounded_random_walk
+from sensors import SENSORS, metric_rows
 
 # Temperature range (Celsius)
 TEMP_MIN = 16.0
@@ -31,83 +34,73 @@ TEMP_MAX = 26.0
 HUMIDITY_MIN = 40.0
 HUMIDITY_MAX = 70.0
 
-# Store last values for random walk per sensor
+# Store last values for random walk, one entry per sensor (in SENSORS order).
+# These are only the starting points for an empty database; see resume_walk().
 LAST_VALUES = {
-    "THS No. 1": {"temp": 21.0, "humidity": 55.0},
-    "THS No. 2": {"temp": 22.0, "humidity": 58.0},
-    "THS No. 3": {"temp": 20.5, "humidity": 52.0},
+    "temp": np.array([21.0, 22.0, 20.5]),
+    "humidity": np.array([55.0, 58.0, 52.0]),
 }
 
 
-def generate_random_walk_value(sensor_id, metric_type):
-    """Generate next value using random walk (last value ± 0.1), keeping within bounds."""
-    last_value = LAST_VALUES[sensor_id][metric_type]
-    
-    # Random walk: ±0.1 with small chance to stay same
-    change = random.choice([-0.1, -0.05, 0, 0.05, 0.1])
-    new_value = last_value + change
-    
-    # Keep within bounds
+def resume_walk(temperatures, humidities):
+    """
+    Continue each sensor's walk from its newest stored reading instead of the defaults,
+    so a restart doesn't make the charts jump.
+
+    Args:
+        temperatures: Array of the latest temperatures in SENSORS order (NaN keeps the default)
+        humidities: Array of the latest humidities in SENSORS order (NaN keeps the default)
+    """
+    for metric_type, values in (("temp", temperatures), ("humidity", humidities)):
+        LAST_VALUES[metric_type] = np.where(np.isnan(values), LAST_VALUES[metric_type], values)
+
+
+def next_random_walk_values(metric_type):
+    """Advance every sensor's random walk by one step (± 0.1), keeping within bounds."""
     if metric_type == "temp":
-        new_value = max(TEMP_MIN, min(TEMP_MAX, new_value))
+        low, high = TEMP_MIN, TEMP_MAX
     else:  # humidity
-        new_value = max(HUMIDITY_MIN, min(HUMIDITY_MAX, new_value))
-    
-    # Store for next iteration
-    LAST_VALUES[sensor_id][metric_type] = new_value
-    return new_value
-
+        low, high = HUMIDITY_MIN, HUMIDITY_MAX
 
-def generate_and_insert_metric(time_index):
-    """Generate a single metric for each sensor and insert into database."""
-    timestamp = int(time.time())
-    
-    conn = get_db()
-    cursor = conn.cursor()
+    values = bounded_random_walk(1, LAST_VALUES[metric_type], low, high)[0]
+    # Store for next iteration
+    LAST_VALUES[metric_type] = values
+    return values
 
-    try:
-        for sensor_id in SENSORS:
-            # Generate random walk values for this sensor
-            temperature = generate_random_walk_value(sensor_id, "temp")
-            humidity = generate_random_walk_value(sensor_id, "humidity")
-
-            cursor.execute(
-                """
-                INSERT INTO metrics (timestamp, sensor_id, temperature, humidity)
-                VALUES (?, ?, ?, ?)
-                """,
-                (timestamp, sensor_id, temperature, humidity),
-            )
-        
-        conn.commit()
-        print(f"[{time.strftime('%H:%M:%S')}] Inserted metrics for 3 sensors")
-    except Exception as e:
-        if "UNIQUE constraint failed" not in str(e):
-            print(f"Error inserting metric: {e}")
-    finally:
-        conn.close()
 
-    # Also clean up old data (older than 60 minutes) to keep DB size manageable
-    clean_old_data()
+def tick(cursor):
+    """
+    Generate a single metric for each sensor and write it into its ring buffer slot.
+    Writing a slot replaces the reading from an hour ago, so no cleanup is needed.
+    Called once per second by the API's scheduler, or by run() when used standalone.
 
+    Args:
+        cursor: Long-lived cursor on an autocommit-mode connection; the INSERT is
+            prepared once and reused from the connection's statement cache
 
-def clean_old_data(minutes=60):
-    """Remove data older than N minutes to keep database size manageable."""
-    cutoff = int(time.time()) - (minutes * 60)
-    
-    conn = get_db()
-    cursor = conn.cursor()
+    Returns:
+        The rows written as (sensor_code, slot, timestamp, temperature_x100, humidity_x100),
+        or an empty list if the write failed
+    """
+    timestamp = int(time.time())
     
+    # Build this tick's batch as columns, one entry per sensor
+    timestamps = np.full(len(SENSORS), timestamp, dtype=np.int64)
+    sensor_codes = np.arange(len(SENSORS), dtype=np.int8)
+    temperatures = next_random_walk_values("temp")
+    humidities = next_random_walk_values("humidity")
+    rows = metric_rows(timestamps, sensor_codes, temperatures, humidities)
+
+    conn = cursor.connection
     try:
-        cursor.execute("DELETE FROM metrics WHERE timestamp < ?", (cutoff,))
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.executemany(INSERT_METRIC, rows)
         conn.commit()
-        deleted = cursor.rowcount
-        if deleted > 0:
-            print(f"  → Cleaned up {deleted} old records")
     except Exception as e:
-        print(f"Error cleaning old data: {e}")
-    finally:
-        conn.close()
+        conn.rollback()
+        print(f"Error inserting metric: {e}")
+        return []
+    return rows
 
 
 def run():
@@ -116,15 +109,21 @@ def run():
     print("Sensors: THS No. 1, THS No. 2, THS No. 3")
     print("Press Ctrl+C to stop\n")
     
-    time_index = 0
+    # One connection for the lifetime of the generator keeps the page cache
+    # and statement cache warm across ticks. Autocommit mode lets each tick
+    # open its own BEGIN IMMEDIATE transaction.
+    conn = get_db(isolation_level=None)
+    cursor = conn.cursor()
     
     try:
         while True:
-            generate_and_insert_metric(time_index)
-            time_index += 1
+            if tick(cursor):
+                print(f"[{time.strftime('%H:%M:%S')}] Inserted metrics for 3 sensors")
             time.sleep(1)
     except KeyboardInterrupt:
         print("\nStopped.")
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
@@ -11,59 +11,125 @@ from pathlib import Path
 DB_PATH = Path(__file__).parent / "metrics.db"
 
 
-def get_db():
+def get_db(isolation_level="", check_same_thread=True):
     """
     Get a database connection.
     Each call returns a new connection (simple, no connection pooling needed for this use case).
+
+    Args:
+        isolation_level: Passed to sqlite3.connect. Use None for autocommit mode
+            when the caller manages transactions with explicit BEGIN/COMMIT.
+        check_same_thread: Passed to sqlite3.connect. Use False for a connection
+            that is used from worker threads, one at a time.
     """
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(
+        str(DB_PATH),
+        isolation_level=isolation_level,
+        check_same_thread=check_same_thread,
+        cached_statements=128,
+    )
     conn.row_factory = sqlite3.Row  # Allow accessing columns by name
+
+    # Per-connection tuning (journal_mode=WAL is persistent and set in init_db)
+    conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, halves fsyncs
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")  # ~64 MB page cache
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
     return conn
 
 
 def init_db():
     """Initialize database schema if it doesn't exist."""
-    from models import CREATE_METRICS_TABLE, CREATE_TIMESTAMP_INDEX, CREATE_SENSOR_INDEX
+    check_schema()
+    init_db_schema_only()
+    drop_legacy_indexes()
+
+
+def check_schema():
+    """
+    Fail clearly if the database holds a metrics table from an older schema.
+    CREATE TABLE IF NOT EXISTS would leave such a table in place, and every
+    read and write against it would then fail on missing columns.
+    """
+    from models import METRICS_COLUMNS
 
     conn = get_db()
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(metrics)")}
+    conn.close()
+
+    # No table yet is fine; init_db_schema_only() creates it
+    if columns and columns != METRICS_COLUMNS:
+        raise RuntimeError(
+            f"{DB_PATH} uses an outdated metrics schema. "
+            "Rebuild it with: python init_db.py"
+        )
+
+
+def init_db_schema_only():
+    """Create the sensors and metrics tables (used by init_db and the bulk loader)."""
+    from models import CREATE_SENSORS_TABLE, SEED_SENSORS, CREATE_METRICS_TABLE
+    from sensors import SENSOR_CODES
+
+    conn = get_db()
+    # WAL lets the API read while the generator writes; the mode persists in the DB file
+    conn.execute("PRAGMA journal_mode=WAL")
     cursor = conn.cursor()
+    cursor.execute(CREATE_SENSORS_TABLE)
+    cursor.executemany(SEED_SENSORS, SENSOR_CODES.items())
     cursor.execute(CREATE_METRICS_TABLE)
-    cursor.execute(CREATE_TIMESTAMP_INDEX)
-    cursor.execute(CREATE_SENSOR_INDEX)
     conn.commit()
     conn.close()
 
 
-def get_metrics_last_n_minutes(minutes=60):
+def drop_tables():
+    """Drop all tables so the database can be rebuilt from scratch."""
+    from models import DROP_TABLES
+
+    conn = get_db()
+    cursor = conn.cursor()
+    for statement in DROP_TABLES:
+        cursor.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+def drop_legacy_indexes():
+    """Drop secondary indexes left on the metrics table by older versions."""
+    from models import DROP_LEGACY_INDEXES
+
+    conn = get_db()
+    cursor = conn.cursor()
+    for statement in DROP_LEGACY_INDEXES:
+        cursor.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+def get_ring_rows(since=0):
     """
-    Fetch metrics from the last N minutes for all sensors, ordered by timestamp ascending.
+    Fetch raw ring buffer rows newer than a timestamp, without converting values.
+    Used to fill and refresh the in-memory ring mirror (see ring.py).
     
     Args:
-        minutes: How many minutes back to fetch (default 60)
+        since: Unix timestamp; only rows newer than this are returned (default: all rows)
     
     Returns:
-        List of dicts with keys: timestamp, sensor_id, temperature, humidity
+        List of tuples: (sensor_code, slot, timestamp, temperature_x100, humidity_x100)
     """
-    import time
-
     conn = get_db()
     cursor = conn.cursor()
-
-    # Calculate cutoff timestamp (Unix seconds)
-    cutoff = int(time.time()) - (minutes * 60)
+    cursor.row_factory = None
 
     cursor.execute(
         """
-        SELECT timestamp, sensor_id, temperature, humidity
+        SELECT sensor_id, slot, timestamp, temperature_x100, humidity_x100
         FROM metrics
         WHERE timestamp > ?
-        ORDER BY sensor_id, timestamp ASC
         """,
-        (cutoff,),
+        (since,),
     )
 
     rows = cursor.fetchall()
     conn.close()
 
-    # Convert sqlite3.Row objects to plain dicts
-    return [dict(row) for row in rows]
+    return rows
@@ -1,4 +1,4 @@
 #!/bin/bash
 
-uvicorn main:app --reload --host 0.0.0.0 --port 8000
+DEV=1 uvicorn main:app --reload --host 0.0.0.0 --port 8000
 
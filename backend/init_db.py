@@ -1,5 +1,5 @@
 """
-Initialize database with 4 hours of mock metric data for 3 sensors.
+Initialize database with 1 hour of mock metric data for 3 sensors.
 Run this once to populate the database:
     python init_db.py
 
@@ -12,16 +12,16 @@ Generates realistic sensor data using random walk:
 """
 
 import time
-import random
 from datetime import datetime, timedelta
-from db import get_db, init_db
+import numpy as np
+from db import get_db, drop_tables, init_db_schema_only
+from models import INSERT_METRIC, RING_SECONDS
+from random_walk import bounded_random_walk
+from sensors import SENSORS, metric_rows
 
-# Number of data points to generate (4 hours = 14,400 seconds)
-HOURS = 4
-DATA_POINTS = HOURS * 3600
-
-# Sensor list: THS = Temperature and Humidity Sensor
-SENSORS = ["THS No. 1", "THS No. 2", "THS No. 3"]
+# Number of data points to generate: exactly fills the metrics ring buffer
+# (1 hour = 3,600 seconds); anything older would just be overwritten
+DATA_POINTS = RING_SECONDS
 
 # Temperature range (Celsius)
 TEMP_MIN = 16.0
@@ -39,80 +39,59 @@ INITIAL_VALUES = {
 }
 
 
-def generate_random_walk_value(sensor_id, metric_type, current_value):
+def generate_random_walks(metric_type):
     """
-    Generate next value using random walk (current ± 0.1), keeping within bounds.
+    Generate the full random walk (± 0.1 per second) for every sensor at once.
     
     Args:
-        sensor_id: The sensor identifier
         metric_type: Either 'temp' or 'humidity'
-        current_value: The current/last value
     
     Returns:
-        New value with random walk applied and bounded
+        Array of shape (DATA_POINTS, len(SENSORS)) with one column per sensor
     """
-    # Random walk: ±0.1 with small chance to stay same
-    change = random.choice([-0.1, -0.05, 0, 0.05, 0.1])
-    new_value = current_value + change
-    
-    # Keep within bounds
     if metric_type == "temp":
-        new_value = max(TEMP_MIN, min(TEMP_MAX, new_value))
+        low, high = TEMP_MIN, TEMP_MAX
     else:  # humidity
-        new_value = max(HUMIDITY_MIN, min(HUMIDITY_MAX, new_value))
-    
-    return new_value
+        low, high = HUMIDITY_MIN, HUMIDITY_MAX
+
+    initial = np.array([INITIAL_VALUES[sensor][metric_type] for sensor in SENSORS])
+    return bounded_random_walk(DATA_POINTS, initial, low, high)
 
 
 def populate_database():
     """Generate and insert mock data into the database for all sensors using random walk."""
-    print(f"Initializing database with {DATA_POINTS * len(SENSORS)} data points ({HOURS} hours × {len(SENSORS)} sensors)...")
+    print(f"Initializing database with {DATA_POINTS * len(SENSORS)} data points ({DATA_POINTS} seconds × {len(SENSORS)} sensors)...")
 
-    # Initialize schema
-    init_db()
+    # Drop and recreate the tables so the load starts from an empty database
+    drop_tables()
+    init_db_schema_only()
 
-    conn = get_db()
+    # Autocommit mode so the bulk load below controls its own transaction
+    conn = get_db(isolation_level=None)
     cursor = conn.cursor()
 
-    # Start 4 hours ago
-    start_time = int(time.time()) - (HOURS * 3600)
-
-    # Keep track of current values for each sensor (for random walk)
-    current_values = {sensor: INITIAL_VALUES[sensor].copy() for sensor in SENSORS}
-
-    # Insert data points for each sensor
-    for i in range(DATA_POINTS):
-        timestamp = start_time + i
-        
-        for sensor_id in SENSORS:
-            # Generate random walk values for this sensor
-            temperature = generate_random_walk_value(
-                sensor_id, "temp", current_values[sensor_id]["temp"]
-            )
-            humidity = generate_random_walk_value(
-                sensor_id, "humidity", current_values[sensor_id]["humidity"]
-            )
-            
-            # Store for next iteration
-            current_values[sensor_id]["temp"] = temperature
-            current_values[sensor_id]["humidity"] = humidity
-
-            try:
-                cursor.execute(
-                    """
-                    INSERT INTO metrics (timestamp, sensor_id, temperature, humidity)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (timestamp, sensor_id, temperature, humidity),
-                )
-            except Exception as e:
-                print(f"Error inserting data point {i} for {sensor_id}: {e}")
-                conn.rollback()
-                conn.close()
-                return
-
-    conn.commit()
-    conn.close()
+    # Start 1 hour ago
+    start_time = int(time.time()) - DATA_POINTS
+
+    # Pre-generate the whole batch as columns (timestamp, sensor) in row-major order,
+    # then convert once into row tuples for a single prepared statement
+    timestamps = np.arange(start_time, start_time + DATA_POINTS, dtype=np.int64).repeat(len(SENSORS))
+    sensor_codes = np.tile(np.arange(len(SENSORS), dtype=np.int8), DATA_POINTS)
+    temperatures = generate_random_walks("temp").ravel()
+    humidities = generate_random_walks("humidity").ravel()
+    rows = metric_rows(timestamps, sensor_codes, temperatures, humidities)
+
+    # Bulk insert everything in one explicit transaction
+    try:
+        conn.execute("BEGIN")
+        cursor.executemany(INSERT_METRIC, rows)
+        conn.commit()
+    except Exception as e:
+        print(f"Error inserting data points: {e}")
+        conn.rollback()
+        return
+    finally:
+        conn.close()
 
     # Show info
     readable_start = datetime.fromtimestamp(start_time).strftime("%Y-%m-%d %H:%M:%S")
@@ -1,56 +1,232 @@
 """
 FastAPI backend for real-time dashboard.
-Single endpoint that returns the last 60 minutes of metrics data.
-Frontend polls this endpoint every second.
+Returns the last 60 minutes of metrics data over HTTP (/api/metrics) and
+pushes new rows to connected clients once per second over a WebSocket (/ws/metrics).
+The data generator also runs in this process (see continuous_data.tick).
 """
 
-from fastapi import FastAPI
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import orjson
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from db import init_db, get_metrics_last_n_minutes
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from starlette.concurrency import run_in_threadpool
+import continuous_data
+import ring
+from db import get_db, init_db, get_ring_rows
 
 # Initialize FastAPI app
 app = FastAPI(title="Realtime Dashboard Backend")
 
-# Enable CORS so the frontend (running on different port) can call this API
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Built frontend (npm run build); served from this app in production
+FRONTEND_DIST = Path(__file__).parent.parent / "frontend" / "dist"
+
+# In development the Vite dev server runs on a different port, so enable CORS.
+# In production the frontend is served from the same origin and every request
+# skips the middleware entirely.
+if os.getenv("DEV"):
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+
+# Last serialized full-window payload, shared by every HTTP poll and WebSocket snapshot in the same second.
+# Cleared whenever the generator writes, so it never outlives the data it was built from.
+_CACHE = {"ts": 0, "payload": b""}
+
+# Connected /ws/metrics clients, and the newest timestamp already pushed to them
+_SUBSCRIBERS = set()
+_BROADCAST = {"last_sent": 0}
+
+# A client that can't take a push within this many seconds is disconnected
+SEND_TIMEOUT = 1.0
+
+# Running push tasks; the event loop only keeps weak references to tasks
+_PUSHES = set()
+
+# The data generator runs inside this process: one write connection, driven by the event loop.
+# The lock is held for each tick and for closing, so shutdown waits for a tick in flight.
+scheduler = AsyncIOScheduler()
+_WRITER = {"conn": None, "cursor": None, "lock": threading.Lock()}
+
+
+def full_window_payload(now):
+    """
+    Return the serialized 60-minute window for the current second.
+    The bytes are built once with orjson and reused by every HTTP poll and
+    WebSocket snapshot until the next second or the next write.
+    """
+    if _CACHE["ts"] != now:
+        _CACHE["payload"] = orjson.dumps({"timestamp": now, "data": ring.rows_since(now - 3600)})
+        _CACHE["ts"] = now
+    return _CACHE["payload"]
+
+
+async def broadcast_metrics(now):
+    """
+    Push the rows added since the previous push to all WebSocket subscribers.
+    Runs once per generator tick, so the delta is read and serialized once for every client.
+    """
+    rows = ring.rows_since(_BROADCAST["last_sent"])
+    if not rows:
+        return
+    _BROADCAST["last_sent"] = ring.latest_timestamp()
+    if not _SUBSCRIBERS:
+        return
+
+    payload = orjson.dumps({"timestamp": now, "data": rows})
+    subscribers = list(_SUBSCRIBERS)
+    results = await asyncio.gather(
+        *(asyncio.wait_for(ws.send_bytes(payload), SEND_TIMEOUT) for ws in subscribers),
+        return_exceptions=True,
+    )
+    # Drop clients whose connection failed or stalled mid-send; closing makes a
+    # stalled client reconnect (or fall back to polling) instead of going quiet
+    for ws, result in zip(subscribers, results):
+        if isinstance(result, Exception):
+            _SUBSCRIBERS.discard(ws)
+            try:
+                await asyncio.wait_for(ws.close(code=1011), SEND_TIMEOUT)
+            except Exception:
+                pass
+
+
+def _write_tick():
+    """Run one generator tick on the writer connection (in the threadpool); no-op once closed."""
+    with _WRITER["lock"]:
+        if _WRITER["conn"] is None:
+            return []
+        return continuous_data.tick(_WRITER["cursor"])
+
+
+def _close_writer():
+    """Close the writer connection once no tick is using it."""
+    with _WRITER["lock"]:
+        if _WRITER["conn"] is not None:
+            _WRITER["conn"].close()
+            _WRITER["conn"] = _WRITER["cursor"] = None
+
+
+async def generate_metrics():
+    """
+    Scheduler job (every second): write one reading per sensor, mirror it into
+    the in-memory ring and push it to WebSocket subscribers.
+    The push runs as its own task, so a slow client can never hold up the next write.
+    """
+    # SQLite work runs in the threadpool; the ring is only touched on the event loop
+    rows = await run_in_threadpool(_write_tick)
+    if not rows:
+        return
+    ring.write_rows(rows)
+    _CACHE["ts"] = 0
+
+    push = asyncio.create_task(broadcast_metrics(int(time.time())))
+    _PUSHES.add(push)
+    push.add_done_callback(_PUSHES.discard)
 
 
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
-    """Create database schema if it doesn't exist."""
+    """Create database schema if it doesn't exist, load the in-memory ring and start the generator."""
     init_db()
+    ring.write_rows(get_ring_rows())
+    _BROADCAST["last_sent"] = ring.latest_timestamp()
+    continuous_data.resume_walk(*ring.latest_values())
 
+    # The scheduler never runs the job concurrently with itself, so the
+    # connection is only ever used by one thread at a time
+    _WRITER["conn"] = get_db(isolation_level=None, check_same_thread=False)
+    _WRITER["cursor"] = _WRITER["conn"].cursor()
+    scheduler.add_job(generate_metrics, "interval", seconds=1)
+    scheduler.start()
 
-@app.get("/api/metrics")
-def get_metrics():
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the generator and close its write connection after any tick in flight."""
+    scheduler.shutdown()
+    await run_in_threadpool(_close_writer)
+
+
+# Returns a pre-serialized Response, so it is kept out of the OpenAPI schema
+@app.get("/api/metrics", include_in_schema=False)
+async def get_metrics(since: Optional[int] = None):
     """
     Get metrics for the last 60 minutes.
+
+    Args:
+        since: Optional Unix timestamp of the newest row the client already has.
+            When given, only newer rows are returned (incremental update).
     
     Returns:
         {
             "timestamp": 1706745600,
             "data": [
-                {"timestamp": 1706745600, "temperature": 20.5, "humidity": 55.2},
+                [1706745600, "THS No. 1", 20.5, 55.2],
                 ...
             ]
         }
+
+    Each row is [timestamp, sensor_id, temperature, humidity]; rows are sent as
+    arrays rather than objects to keep the payload and serialization cost small.
     
-    Frontend polls this endpoint every 1 second to get fresh data.
+    The dashboard polls this endpoint every 1 second only while its
+    WebSocket (/ws/metrics) is down; otherwise updates arrive by push.
     The timestamp field contains the current server time for client display.
+    Rows are read from the in-memory ring, not from SQLite, and returned as
+    orjson bytes in a raw Response, bypassing FastAPI's jsonable_encoder and
+    response validation. The full-window payload is also cached until the
+    next write; incremental requests (with `since`) return only a few rows
+    and skip the cache.
     """
-    import time
-    metrics = get_metrics_last_n_minutes(minutes=60)
-    return {
-        "timestamp": int(time.time()),
-        "data": metrics
-    }
+    now = int(time.time())
+
+    if since is not None:
+        metrics = ring.rows_since(max(since, now - 3600))
+        return Response(
+            orjson.dumps({"timestamp": now, "data": metrics}),
+            media_type="application/json",
+        )
+
+    return Response(full_window_payload(now), media_type="application/json")
+
+
+@app.websocket("/ws/metrics")
+async def metrics_websocket(websocket: WebSocket):
+    """
+    Stream metrics to the client.
+    
+    On connect the client receives the full 60-minute window, then one message
+    per second with only the new rows. Messages are binary frames with the same
+    JSON payload as /api/metrics: {"timestamp": ..., "data": [[ts, sensor_id, temp, humidity], ...]}
+    """
+    await websocket.accept()
+
+    # Subscribe before sending the snapshot so a tick that lands while the snapshot
+    # is in flight is still pushed; the client merges overlapping rows by key
+    _SUBSCRIBERS.add(websocket)
+    try:
+        await websocket.send_bytes(full_window_payload(int(time.time())))
+        # Nothing is expected from the client; this just waits for the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        _SUBSCRIBERS.discard(websocket)
 
 
 @app.get("/health")
@@ -59,6 +235,11 @@ def health_check():
     return {"status": "ok"}
 
 
+# Mounted last so the API routes above take precedence over static files
+if FRONTEND_DIST.is_dir():
+    app.mount("/", StaticFiles(directory=str(FRONTEND_DIST), html=True), name="frontend")
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -4,23 +4,59 @@ Supports multiple sensors: THS No. 1, THS No. 2, THS No. 3
 THS = Temperature and Humidity Sensor
 """
 
-# SQL to create the metrics table
+# SQL to create the sensors lookup table (id is the sensor code, name e.g. "THS No. 1")
+CREATE_SENSORS_TABLE = """
+    CREATE TABLE IF NOT EXISTS sensors (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+"""
+
+# Seed one row per sensor; parameters are (id, name)
+SEED_SENSORS = """
+    INSERT OR IGNORE INTO sensors (id, name) VALUES (?, ?)
+"""
+
+# Temperature and humidity are stored as scaled integers (value × VALUE_SCALE).
+# Readings move in 0.05 steps, so hundredths are exact and fit in 2-byte varints.
+VALUE_SCALE = 100
+
+# The metrics table is a fixed-size ring buffer: one slot per second per sensor.
+# A reading goes to slot = timestamp % RING_SECONDS and overwrites whatever was
+# there an hour ago, so retention needs no DELETEs.
+RING_SECONDS = 3600
+
+# SQL to create the metrics table; sensor_id is the integer sensor code
 CREATE_METRICS_TABLE = """
     CREATE TABLE IF NOT EXISTS metrics (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sensor_id INTEGER NOT NULL REFERENCES sensors(id),
+        slot INTEGER NOT NULL,
         timestamp INTEGER NOT NULL,
-        sensor_id TEXT NOT NULL,
-        temperature REAL NOT NULL,
-        humidity REAL NOT NULL,
-        UNIQUE(timestamp, sensor_id)
-    )
+        temperature_x100 INTEGER NOT NULL,
+        humidity_x100 INTEGER NOT NULL,
+        PRIMARY KEY (sensor_id, slot)
+    ) WITHOUT ROWID
 """
 
-# Index for faster queries on timestamp and sensor_id
-CREATE_TIMESTAMP_INDEX = """
-    CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics(timestamp)
-"""
+# Columns of the current metrics table, used to detect databases built with an older schema
+METRICS_COLUMNS = {"sensor_id", "slot", "timestamp", "temperature_x100", "humidity_x100"}
 
-CREATE_SENSOR_INDEX = """
-    CREATE INDEX IF NOT EXISTS idx_metrics_sensor ON metrics(sensor_id)
+# Write a reading into its ring slot, replacing the previous occupant
+INSERT_METRIC = """
+    INSERT OR REPLACE INTO metrics (sensor_id, slot, timestamp, temperature_x100, humidity_x100)
+    VALUES (?, ?, ?, ?, ?)
 """
+
+# Drop all tables before a full reload (also clears databases using an older schema)
+DROP_TABLES = [
+    "DROP TABLE IF EXISTS metrics",
+    "DROP TABLE IF EXISTS sensors",
+]
+
+# Secondary indexes from older schemas. Reads are served from the in-memory ring
+# (ring.py), so an index would only add cost to every INSERT OR REPLACE.
+DROP_LEGACY_INDEXES = [
+    "DROP INDEX IF EXISTS idx_metrics_timestamp",
+    "DROP INDEX IF EXISTS idx_metrics_sensor",
+    "DROP INDEX IF EXISTS idx_metrics_sensor_ts_cov",
+]
@@ -0,0 +1,41 @@
+"""
+Bounded random walk kernel shared by the data generators.
+Compiled with Numba so the per-step loop runs at native speed.
+"""
+
+import numpy as np
+from numba import njit
+
+# Possible random walk steps per second (small chance to stay the same)
+WALK_STEPS = np.array([-0.1, -0.05, 0.0, 0.05, 0.1])
+
+
+@njit(cache=True)
+def bounded_random_walk(n, initial, low, high, seed=-1):
+    """
+    Generate n steps of a random walk for several sensors, clipping after every step.
+
+    Args:
+        n: Number of steps (seconds) to generate
+        initial: Array of starting values, one per sensor
+        low: Lower bound applied after each step
+        high: Upper bound applied after each step
+        seed: Seed for the random generator; negative leaves it unseeded
+
+    Returns:
+        Array of shape (n, len(initial)); row i holds the values after step i + 1
+    """
+    if seed >= 0:
+        np.random.seed(seed)
+
+    n_sensors = initial.shape[0]
+    values = np.empty((n, n_sensors))
+    current = initial.copy()
+
+    for i in range(n):
+        for s in range(n_sensors):
+            value = current[s] + WALK_STEPS[np.random.randint(WALK_STEPS.shape[0])]
+            current[s] = min(max(value, low), high)
+            values[i, s] = current[s]
+
+    return values
@@ -0,0 +1,86 @@
+"""
+In-memory mirror of the metrics ring buffer.
+The API serves reads from here; SQLite stays the durable copy.
+
+Layout is one row per sensor and one column per ring slot (slot = timestamp % RING_SECONDS),
+with values kept as scaled integers exactly as they are stored in the database.
+"""
+
+from itertools import repeat
+
+import numpy as np
+from models import RING_SECONDS, VALUE_SCALE
+from sensors import SENSORS, SENSOR_CODES
+
+_RING = {
+    "ts": np.zeros((len(SENSORS), RING_SECONDS), dtype=np.int64),
+    "temp": np.zeros((len(SENSORS), RING_SECONDS), dtype=np.int16),
+    "humidity": np.zeros((len(SENSORS), RING_SECONDS), dtype=np.int16),
+}
+
+
+def write_rows(rows):
+    """
+    Write ring rows into the mirror.
+    
+    Args:
+        rows: Iterable of (sensor_code, slot, timestamp, temperature_x100, humidity_x100),
+            the same shape as models.INSERT_METRIC parameters
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    sensor_codes, slots, timestamps, temperatures, humidities = (np.array(col) for col in zip(*rows))
+    _RING["ts"][sensor_codes, slots] = timestamps
+    _RING["temp"][sensor_codes, slots] = temperatures
+    _RING["humidity"][sensor_codes, slots] = humidities
+
+
+def latest_timestamp():
+    """Return the newest timestamp held in the mirror (0 if empty)."""
+    return int(_RING["ts"].max())
+
+
+def latest_values():
+    """
+    Return each sensor's newest reading, used to resume the random walk after a restart.
+
+    Returns:
+        Tuple of float arrays (temperatures, humidities) in SENSORS order;
+        NaN for a sensor with no readings in the mirror
+    """
+    sensors = np.arange(len(SENSORS))
+    newest = _RING["ts"].argmax(axis=1)
+    empty = _RING["ts"][sensors, newest] == 0
+    temperatures = _RING["temp"][sensors, newest] / VALUE_SCALE
+    humidities = _RING["humidity"][sensors, newest] / VALUE_SCALE
+    temperatures[empty] = np.nan
+    humidities[empty] = np.nan
+    return temperatures, humidities
+
+
+def rows_since(cutoff):
+    """
+    Read rows newer than a timestamp, ordered by sensor then timestamp.
+    
+    Args:
+        cutoff: Unix timestamp; only rows newer than this are returned
+    
+    Returns:
+        List of tuples: (timestamp, sensor_id, temperature, humidity),
+        the row format served by /api/metrics
+    """
+    rows = []
+    for code, name in SENSOR_CODES.items():
+        timestamps = _RING["ts"][code]
+        slots = np.flatnonzero(timestamps > cutoff)
+        # Slots wrap around, so sort the selected slots by timestamp
+        slots = slots[np.argsort(timestamps[slots], kind="stable")]
+        rows.extend(zip(
+            timestamps[slots].tolist(),
+            repeat(name),
+            (_RING["temp"][code, slots] / VALUE_SCALE).tolist(),
+            (_RING["humidity"][code, slots] / VALUE_SCALE).tolist(),
+        ))
+    return rows
@@ -0,0 +1,37 @@
+"""
+Sensor definitions and helpers for building metric rows from columnar batches.
+THS = Temperature and Humidity Sensor
+"""
+
+import numpy as np
+from models import RING_SECONDS, VALUE_SCALE
+
+# Sensor list; a sensor's code (sensors.id / metrics.sensor_id) is its index in this list
+SENSORS = ["THS No. 1", "THS No. 2", "THS No. 3"]
+
+# Sensor code -> sensor name, used to seed the sensors table
+SENSOR_CODES = dict(enumerate(SENSORS))
+
+
+def metric_rows(timestamps, sensor_codes, temperatures, humidities):
+    """
+    Convert a columnar batch of metrics into row tuples for executemany (models.INSERT_METRIC).
+    Each row gets its ring slot, and temperature and humidity are scaled to
+    integers (see models.RING_SECONDS and models.VALUE_SCALE).
+
+    Args:
+        timestamps: int64 array of Unix timestamps
+        sensor_codes: Small-int array of sensor codes (see SENSOR_CODES)
+        temperatures: Array of temperature values
+        humidities: Array of humidity values
+
+    Returns:
+        List of (sensor_code, slot, timestamp, temperature_x100, humidity_x100) tuples of Python ints
+    """
+    return np.rec.fromarrays([
+        sensor_codes,
+        timestamps % RING_SECONDS,
+        timestamps,
+        np.rint(temperatures * VALUE_SCALE).astype(np.int16),
+        np.rint(humidities * VALUE_SCALE).astype(np.int16),
+    ]).tolist()
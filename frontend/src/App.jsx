@@ -1,6 +1,6 @@
-import { useState, useEffect, useMemo } from 'react'
+import { useState, useEffect, useMemo, useRef } from 'react'
 import RealtimeChart from './components/RealtimeChart'
-import { formatDateTime } from './api'
+import { API_BASE, METRICS_WS_URL, formatDateTime, rowToMetric } from './api'
 import { calculateTemperatureRanges, aggregateTemperatureByBucket, getCurrentValues } from './utils'
 import { mergeMetrics, filterExpiredData, saveMetricsToStorage, loadMetricsFromStorage, getNewDataPointCount } from './dataManager'
 import { PieChart, Pie, Cell, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts'
@@ -17,6 +17,7 @@ import './App.css'
  * 4. STORAGE RECOVERY: On page load, state is hydrated from localStorage
  * 5. DATA CLEANUP: Old data (>60 min) is automatically removed
  * 6. DECOUPLED RENDERING: Charts render from buffered state, independent of API polling
+ * 7. LIVE PUSH: New rows arrive over a WebSocket; HTTP polling is the fallback
  * 
  * BENEFITS:
  * - Smooth, responsive charts even during data updates
@@ -41,6 +42,12 @@ function App() {
     const [currentTime, setCurrentTime] = useState(Date.now())
     const [dataFreshness, setDataFreshness] = useState('🟢 Live')
 
+    // Newest data timestamp received from the API; polls only ask for newer rows
+    const lastTimestampRef = useRef(null)
+
+    // Whether the metrics WebSocket is connected; polling pauses while it is
+    const wsConnectedRef = useRef(false)
+
     // Theme state
     const [theme, setTheme] = useState('dark')
 
@@ -137,6 +144,95 @@ function App() {
         })
     }
 
+    /**
+     * Remember the newest timestamp in a response so the next poll can
+     * request only rows after it (?since=<ts>).
+     */
+    const trackLatestTimestamp = (rows) => {
+        const newest = rows.reduce((max, row) => Math.max(max, row[0]), lastTimestampRef.current ?? 0)
+        lastTimestampRef.current = newest
+    }
+
+    /**
+     * Apply a metrics payload ({timestamp, data: [[ts, sensor_id, temp, humidity], ...]})
+     * from either the HTTP endpoint or the WebSocket.
+     */
+    const handleMetricsPayload = (json) => {
+        if (json.data && json.data.length > 0) {
+            trackLatestTimestamp(json.data)
+            // Use append-only update instead of replacement
+            updateMetricsWithNewData(json.data.map(rowToMetric))
+            setCurrentTime(Date.now())
+            if (json.timestamp) {
+                setLastUpdatedTime(formatDateTime(json.timestamp))
+            }
+        }
+    }
+
+    /**
+     * Fetch metrics over HTTP, used while the WebSocket is unavailable.
+     * The first request fetches the full window; later ones send ?since=<ts>
+     * so the backend returns only the rows added since the last response.
+     */
+    const pollMetrics = async () => {
+        try {
+            const since = lastTimestampRef.current
+            const url = since === null
+                ? `${API_BASE}/api/metrics`
+                : `${API_BASE}/api/metrics?since=${since}`
+            const response = await fetch(url)
+            if (response.ok) {
+                handleMetricsPayload(await response.json())
+            }
+        } catch (error) {
+            console.error('Failed to fetch metrics:', error)
+        }
+        setLoading(false)
+    }
+
+    // ========== LIVE PUSH OVER WEBSOCKET ==========
+    /**
+     * Subscribe to /ws/metrics. The server sends the full window on connect,
+     * then only the new rows once per second. If the socket can't connect or
+     * drops, one poll runs right away and polling takes over until the
+     * reconnect succeeds.
+     */
+    useEffect(() => {
+        let socket
+        let reconnectTimer
+        let stopped = false
+        const decoder = new TextDecoder()
+
+        const connect = () => {
+            socket = new WebSocket(METRICS_WS_URL)
+            socket.binaryType = 'arraybuffer'
+            socket.onopen = () => {
+                wsConnectedRef.current = true
+            }
+            socket.onmessage = (event) => {
+                const text = typeof event.data === 'string' ? event.data : decoder.decode(event.data)
+                handleMetricsPayload(JSON.parse(text))
+                setLoading(false)
+            }
+            socket.onclose = () => {
+                wsConnectedRef.current = false
+                if (!stopped) {
+                    // Don't wait for the polling interval (10s by default) for data
+                    pollMetrics()
+                    reconnectTimer = setTimeout(connect, 5000)
+                }
+            }
+        }
+
+        connect()
+
+        return () => {
+            stopped = true
+            clearTimeout(reconnectTimer)
+            socket.close()
+        }
+    }, [])
+
     // ========== DATA POLLING WITH APPEND-ONLY UPDATES ==========
     /**
      * Poll the API at the configured interval.
@@ -145,48 +241,16 @@ function App() {
      * - Merges incoming data with existing buffered data
      * - No full dataset replacement - only new points are added
      * - Charts remain responsive because data updates are incremental
+     * - Polls are skipped while the WebSocket is delivering updates, so the
+     *   full window is only fetched over HTTP when the socket can't connect
+     *   (the WebSocket effect polls immediately when that happens)
      */
     useEffect(() => {
-        const pollInterval = setInterval(async () => {
-            try {
-                const response = await fetch('http://localhost:8000/api/metrics')
-                if (response.ok) {
-                    const json = await response.json()
-                    if (json.data && json.data.length > 0) {
-                        // Use append-only update instead of replacement
-                        updateMetricsWithNewData(json.data)
-                        setCurrentTime(Date.now())
-                        if (json.timestamp) {
-                            setLastUpdatedTime(formatDateTime(json.timestamp))
-                        }
-                    }
-                }
-            } catch (error) {
-                console.error('Failed to fetch metrics:', error)
-            }
-            setLoading(false)
+        const pollInterval = setInterval(() => {
+            if (wsConnectedRef.current) return
+            pollMetrics()
         }, pollingInterval)
 
-        // Fetch immediately on mount using append-only pattern
-        // If localStorage has data, it's already loaded into state
-        // This fetch will merge with that data
-        fetch('http://localhost:8000/api/metrics')
-            .then((res) => res.json())
-            .then((json) => {
-                if (json.data && json.data.length > 0) {
-                    updateMetricsWithNewData(json.data)
-                    setCurrentTime(Date.now())
-                    if (json.timestamp) {
-                        setLastUpdatedTime(formatDateTime(json.timestamp))
-                    }
-                }
-                setLoading(false)
-            })
-            .catch((err) => {
-                console.error('Initial fetch error:', err)
-                setLoading(false)
-            })
-
         return () => clearInterval(pollInterval)
     }, [pollingInterval])
 
@@ -436,7 +500,7 @@ function App() {
             <div className="dashboard-footer">
                 <strong>How it works:</strong>
                 <ul style={{ marginTop: '10px', marginLeft: '20px', lineHeight: '1.6' }}>
-                    <li>Frontend polls <code>/api/metrics</code> every 1 second (configurable)</li>
+                    <li>Backend pushes new rows over <code>/ws/metrics</code> every second; the frontend falls back to polling <code>/api/metrics</code> if the socket drops</li>
                     <li>Shows all 3 sensors (THS No. 1, 2, 3) with distinct colors on individual charts</li>
                     <li>Automatic alerts if no data for &gt;1 minute</li>
                     <li>Data limited to last 60 minutes for performance optimization</li>
@@ -1,28 +1,47 @@
 /**
- * API polling logic for real-time metrics.
+ * API helpers for real-time metrics.
  * 
- * Why polling instead of WebSockets?
- * - Simpler architecture for small dashboards
- * - Works anywhere (including behind corporate proxies)
- * - Easier to scale horizontally
- * - Sufficient latency (1-second poll) for most dashboards
+ * Live updates normally arrive over the /ws/metrics WebSocket (see App.jsx).
+ * HTTP polling of /api/metrics is kept as the fallback because it:
+ * - Works anywhere (including behind corporate proxies that block WebSockets)
+ * - Needs no connection state on the server
  */
 
-const API_BASE = 'http://localhost:8000'
+// In development the backend runs on its own port (with CORS enabled via DEV=1);
+// in production the backend serves the built frontend, so requests are same-origin.
+export const API_BASE = import.meta.env.DEV ? 'http://localhost:8000' : ''
+
+// WebSocket URL for live metrics, following the same dev/production split
+export const METRICS_WS_URL = import.meta.env.DEV
+  ? 'ws://localhost:8000/ws/metrics'
+  : `${window.location.protocol === 'https:' ? 'wss' : 'ws'}://${window.location.host}/ws/metrics`
+
+/**
+ * Convert a compact row from the backend into a metric object.
+ * The backend sends rows as [timestamp, sensor_id, temperature, humidity].
+ * 
+ * @param {Array} row - Row array in backend column order
+ * @returns {Object} Metric object: {timestamp, sensor_id, temperature, humidity}
+ */
+export function rowToMetric([timestamp, sensor_id, temperature, humidity]) {
+  return { timestamp, sensor_id, temperature, humidity }
+}
 
 /**
  * Fetch metrics for the last 60 minutes from the backend.
  * 
- * @returns {Promise<Array>} Array of metric objects: {timestamp, temperature, humidity}
+ * @param {number} [since] - Only return rows newer than this Unix timestamp
+ * @returns {Promise<Array>} Array of metric objects: {timestamp, sensor_id, temperature, humidity}
  */
-export async function fetchMetrics() {
+export async function fetchMetrics(since) {
   try {
-    const response = await fetch(`${API_BASE}/api/metrics`)
+    const query = since === undefined ? '' : `?since=${since}`
+    const response = await fetch(`${API_BASE}/api/metrics${query}`)
     if (!response.ok) {
       throw new Error(`API error: ${response.status}`)
     }
     const json = await response.json()
-    return json.data || []
+    return (json.data || []).map(rowToMetric)
   } catch (error) {
     console.error('Failed to fetch metrics:', error)
     return []
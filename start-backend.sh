@@ -8,4 +8,4 @@ source venv/bin/activate
 pip install -q -r requirements.txt
 
 # Start backend with auto-reload for development
-uvicorn backend.main:app --reload --host 0.0.0.0 --port 8000
+DEV=1 uvicorn backend.main:app --reload --host 0.0.0.0 --port 8000
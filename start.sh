@@ -21,7 +21,7 @@ if [ ! -f "metrics.db" ]; then
 fi
 
 echo "🟢 Starting backend on http://localhost:8000"
-python main.py &
+DEV=1 python main.py &
 BACKEND_PID=$!
 
 cd ..